@@ -0,0 +1,50 @@
+# file: src/website_creator/artifacts.py
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+
+ARTIFACTS_DIR = Path("artifacts")
+
+
+def dump_json(payload: Dict[str, Any], indent: bool = False) -> bytes:
+    # why: orjson serializes straight to UTF-8 bytes, skipping str building + a second encode
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(payload, option=option)
+    return json.dumps(payload, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def write_bytes(path: str | Path, data: bytes) -> None:
+    """Atomically replace `path` with `data` using raw fd writes (no text or buffer layer)."""
+    path = Path(path)
+    # why: concurrent readers must never observe a truncated, half-written file
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.close(fd)
+        fd = -1
+        os.replace(tmp, path)
+    except BaseException:
+        if fd >= 0:
+            os.close(fd)
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+async def awrite_bytes(path: str | Path, data: bytes) -> None:
+    # why: batch runs finish many crews at once; one worker-thread hop per file keeps the loop free
+    await asyncio.to_thread(write_bytes, path, data)
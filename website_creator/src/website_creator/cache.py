@@ -0,0 +1,64 @@
+# file: src/website_creator/cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+from website_creator.artifacts import ARTIFACTS_DIR, dump_json, write_bytes
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:  # evicted by a concurrent writer
+        return 0
+
+
+class ResponseCache:
+    """On-disk cache of JSON-serializable crew outputs, keyed by name, inputs, models and config.
+
+    Entries live in ``<root>/<sha256>.json``; file mtime tracks recency, and the least
+    recently used entries are evicted once more than ``max_entries`` are stored.
+    """
+
+    def __init__(self, root: str | Path = ARTIFACTS_DIR / ".cache", max_entries: int = 100) -> None:
+        self.root = Path(root)
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(name: str, inputs: Dict[str, Any], models: str, config_digest: str = "") -> str:
+        h = hashlib.sha256()
+        for part in (
+            name,
+            json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str),
+            models,
+            config_digest,
+        ):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")  # why: keep ("ab", "c") and ("a", "bc") distinct
+        return h.hexdigest()
+
+    def get(self, key: str) -> Any:
+        path = self.root / f"{key}.json"
+        try:
+            output = json.loads(path.read_bytes())["output"]
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return output
+
+    def put(self, key: str, output: Any) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        write_bytes(self.root / f"{key}.json", dump_json({"output": output}))
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = sorted(self.root.glob("*.json"), key=_mtime_ns)
+            for path in entries[: max(0, len(entries) - self.max_entries)]:
+                path.unlink(missing_ok=True)
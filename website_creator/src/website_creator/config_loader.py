@@ -0,0 +1,132 @@
+# file: src/website_creator/config_loader.py
+from __future__ import annotations
+
+import copy
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+try:
+    # libyaml C bindings parse several times faster than the pure-Python loader.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+
+CONFIG_DIR = Path(__file__).parent / "config"
+
+# mkstemp creates files as 0600; sidecars get the mode a plain open() would have given them.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """Read a boolean env var: unset/blank gives `default`; 0/false/no/off are false."""
+    value = os.environ.get(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _sidecar(path: Path) -> Path:
+    return path.with_name(path.name + ".json")
+
+
+def _write_sidecar(sidecar: Path, data: Dict[str, Any]) -> None:
+    # Why: write to a temp file and rename so concurrent readers never see a partial cache.
+    fd, tmp = tempfile.mkstemp(dir=sidecar.parent, prefix=sidecar.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, ensure_ascii=False)
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, sidecar)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+@functools.lru_cache(maxsize=16)
+def _load_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # mtime_ns and size are part of the memo key, so an edited YAML gets a fresh entry.
+    path = Path(path_str)
+    sidecar = _sidecar(path)
+    try:
+        cached = json.loads(sidecar.read_bytes())
+        # Why: exact match, not "sidecar is newer"; cp -p, rsync -a and tar restore old mtimes.
+        if (
+            isinstance(cached, dict)
+            and cached.get("mtime_ns") == mtime_ns
+            and cached.get("size") == size
+            and isinstance(cached.get("data"), dict)
+        ):
+            return cached["data"]
+    except (OSError, ValueError):
+        pass  # missing or unreadable cache: fall through to a real parse
+
+    with open(path, "r", encoding="utf-8") as fh:
+        data = yaml.load(fh, Loader=_YamlLoader)
+    if not isinstance(data, dict):
+        data = {}  # same contract as CrewBase.load_yaml: an empty YAML loads as {}
+
+    try:
+        # Only cache what JSON reproduces exactly (int keys, dates, ... would come back changed).
+        if json.loads(json.dumps(data)) == data:
+            _write_sidecar(sidecar, {"mtime_ns": mtime_ns, "size": size, "data": data})
+    except (OSError, TypeError, ValueError):
+        pass  # read-only install or non-JSON YAML values: cache is best-effort
+    return data
+
+
+def load_config(config_path: str | Path) -> Dict[str, Any]:
+    """Load a YAML config, reusing its `<name>.yaml.json` sidecar while the stamp still matches.
+
+    The sidecar records the YAML's mtime_ns and size and is only trusted on an exact match.
+    Parsed configs are memoized per (path, mtime, size) for the life of the process.
+    """
+    path = Path(config_path)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        print(f"File not found: {path}")
+        raise
+    # Why: CrewBase mutates the loaded dicts in place, so every caller gets its own copy.
+    return copy.deepcopy(_load_cached(str(path.resolve()), st.st_mtime_ns, st.st_size))
+
+
+def config_digest(*config_paths: str | Path) -> str:
+    """Return a sha256 over the parsed contents of `config_paths`, e.g. for cache keys."""
+    h = hashlib.sha256()
+    for config_path in config_paths:
+        # YAML key order is stable per file; sort_keys would raise on mixed int/str keys.
+        data = load_config(config_path)
+        h.update(json.dumps(data, ensure_ascii=False, default=str).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def execution_waves(tasks_cfg: Dict[str, Any]) -> List[List[str]]:
+    # Why: group tasks by dependency depth; surfaces cycles/unknown depends_on before any kickoff.
+    pending = {
+        name: set(spec.get("depends_on") or [])
+        for name, spec in tasks_cfg.items()
+        if name != "defaults" and isinstance(spec, dict)
+    }
+    done: set[str] = set()
+    waves: List[List[str]] = []
+    while pending:
+        ready = [name for name, deps in pending.items() if deps <= done]
+        if not ready:
+            raise ValueError(
+                f"Unresolvable depends_on for tasks {sorted(pending)}. Check your YAML."
+            )
+        for name in ready:
+            del pending[name]
+        done.update(ready)
+        waves.append(ready)
+    return waves
@@ -1,17 +1,25 @@
 # file: src/crew/crew.py
 from __future__ import annotations
 
+import asyncio
+import functools
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Dict, List
 
-from crewai import Agent, Crew, Process, Task
+from crewai import LLM, Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 
+from website_creator.artifacts import ARTIFACTS_DIR, awrite_bytes, dump_json, write_bytes
+from website_creator.cache import ResponseCache
+from website_creator.config_loader import config_digest, env_flag, load_config
+from website_creator.validation import output_guardrail
+
 
 def _ensure_dir(path: str | Path) -> None:
-    p = Path(path)
-    if not p.exists():
-        p.mkdir(parents=True, exist_ok=True)
+    # exist_ok already makes this a single mkdir syscall; no exists() pre-check needed.
+    Path(path).mkdir(parents=True, exist_ok=True)
 
 
 def _get(cfg: Dict[str, Any], key: str, kind: str) -> Dict[str, Any]:
@@ -21,6 +29,76 @@ def _get(cfg: Dict[str, Any], key: str, kind: str) -> Dict[str, Any]:
     return cfg[key]
 
 
+def _model_name(agent: Any) -> str:
+    llm = getattr(agent, "llm", None)
+    return str(getattr(llm, "model", None) or getattr(llm, "model_name", None) or llm or "")
+
+
+def _is_run_output(value: Any) -> bool:
+    # Why: a stale or hand-edited cache entry must count as a miss, not crash the replay.
+    return (
+        isinstance(value, dict)
+        and isinstance(value.get("raw"), str)
+        and isinstance(value.get("tasks_output"), dict)
+        and all(isinstance(raw, str) for raw in value["tasks_output"].values())
+    )
+
+
+# Static task contexts, built once and read-only so CrewAI cannot mutate the shared copy.
+_PLANNER_CTX = MappingProxyType(
+    {
+        "customer_request": "{customer_request}",
+    }
+)
+_TEAM_LEADER_CTX = MappingProxyType(
+    {
+        "planner_output": "planner_task.output",
+        "website_name": "{website_name}",
+    }
+)
+_FRONTEND_CTX = MappingProxyType(
+    {
+        "planner_output": "planner_task.output",
+        "leader_blueprint": "team_leader_task.output",
+        "ui_framework": "gradio",
+    }
+)
+_BACKEND_CTX = MappingProxyType(
+    {
+        "planner_output": "planner_task.output",
+        "leader_blueprint": "team_leader_task.output",
+        "shared_classes": "frontend_developer_task.output.shared_classes",
+    }
+)
+_INTEGRATION_CTX = MappingProxyType(
+    {
+        "frontend_artifact": "frontend_developer_task.output",
+        "backend_artifact": "backend_developer_task.output",
+        "planner_output": "planner_task.output",
+    }
+)
+_REPOSITORY_CTX = MappingProxyType(
+    {
+        "integration_output": "integration_task.output",
+        "website_folder": "website",
+    }
+)
+_TESTING_CTX = MappingProxyType(
+    {
+        "features": "planner_task.output.features",
+        "final_directory": "repository_management_task.output.final_directory",
+        "launch_cmd": "python app.py",
+    }
+)
+_EVALUATION_CTX = MappingProxyType(
+    {
+        "customer_request": "{customer_request}",
+        "test_report": "testing_task.output",
+        "repo_summary": "repository_management_task.output",
+    }
+)
+
+
 @CrewBase
 class WebsiteCreator:
     """WebsiteCreator crew"""
@@ -29,9 +107,30 @@ class WebsiteCreator:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
-    def __init__(self) -> None:
+    def __init__(self, cache_max_entries: int = 100, verbose: bool | None = None) -> None:
         # Ensure artifacts dir exists before any Task tries to write.
         _ensure_dir("artifacts")
+        # Agent chatter stays on by default for dev runs; WC_VERBOSE=0 turns it off.
+        self.verbose = env_flag("WC_VERBOSE", True) if verbose is None else verbose
+        self.response_cache = ResponseCache(max_entries=cache_max_entries)
+        # CrewBase loads the YAMLs right after __init__; the memoized loader hands it the same data.
+        config_dir = Path(__file__).parent
+        self.config_digest = config_digest(
+            config_dir / self.agents_config, config_dir / self.tasks_config
+        )
+
+    @classmethod
+    def warmup(cls) -> None:
+        """Pay LLM client / tokenizer cold-start once per process instead of on the first kickoff."""
+        _ensure_dir("artifacts")
+        agents_cfg = load_config(Path(__file__).parent / cls.agents_config)
+        model = _get(agents_cfg, "defaults", "agent")["llm"]
+        # One 1-token completion initializes litellm's client, auth and connection pool.
+        LLM(model=model, max_tokens=1).call([{"role": "user", "content": "ping"}])
+
+        import litellm  # crewai dependency; token_counter loads and caches the tokenizer
+
+        litellm.token_counter(model=model, text="warmup")
 
     # ---------------------------
     # Agents
@@ -41,7 +140,7 @@ class WebsiteCreator:
     def planner(self) -> Agent:
         return Agent(
             config=_get(self.agents_config, "planner", "agent"),  # type: ignore[arg-type]
-            verbose=True,
+            verbose=self.verbose,
             allow_code_execution=False,
             code_execution_mode="safe",
             max_execution_time=180,
@@ -55,7 +154,7 @@ class WebsiteCreator:
     def team_leader(self) -> Agent:
         return Agent(
             config=_get(self.agents_config, "team_leader", "agent"),
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=True,
             allow_code_execution=False,
             code_execution_mode="safe",
@@ -70,7 +169,7 @@ class WebsiteCreator:
     def frontend_developer(self) -> Agent:
         return Agent(
             config=_get(self.agents_config, "frontend_developer", "agent"),
-            verbose=True,
+            verbose=self.verbose,
             allow_code_execution=True,  # only if you actually use code-exec tools
             code_execution_mode="safe",
             max_execution_time=600,
@@ -84,7 +183,7 @@ class WebsiteCreator:
     def backend_developer(self) -> Agent:
         return Agent(
             config=_get(self.agents_config, "backend_developer", "agent"),
-            verbose=True,
+            verbose=self.verbose,
             allow_code_execution=True,
             code_execution_mode="safe",
             max_execution_time=600,
@@ -98,7 +197,7 @@ class WebsiteCreator:
     def integrator(self) -> Agent:
         return Agent(
             config=_get(self.agents_config, "integrator", "agent"),
-            verbose=True,
+            verbose=self.verbose,
             allow_code_execution=False,
             code_execution_mode="safe",
             max_execution_time=300,
@@ -112,7 +211,7 @@ class WebsiteCreator:
     def tester(self) -> Agent:
         return Agent(
             config=_get(self.agents_config, "tester", "agent"),
-            verbose=True,
+            verbose=self.verbose,
             allow_code_execution=False,
             code_execution_mode="safe",
             max_execution_time=180,
@@ -126,7 +225,7 @@ class WebsiteCreator:
     def evaluator(self) -> Agent:
         return Agent(
             config=_get(self.agents_config, "evaluator", "agent"),
-            verbose=True,
+            verbose=self.verbose,
             allow_code_execution=False,
             code_execution_mode="safe",
             max_execution_time=180,
@@ -140,7 +239,7 @@ class WebsiteCreator:
     def repository_manager(self) -> Agent:
         return Agent(
             config=_get(self.agents_config, "repository_manager", "agent"),
-            verbose=True,
+            verbose=self.verbose,
             allow_code_execution=False,
             code_execution_mode="safe",
             max_execution_time=300,
@@ -154,12 +253,17 @@ class WebsiteCreator:
     # Tasks
     # ---------------------------
 
+    def _schema_guardrail(self, task_name: str) -> Any:
+        # Validators are compiled once per distinct schema and shared across instances/runs.
+        schema = _get(self.tasks_config, task_name, "task").get("expected_output_schema")
+        return output_guardrail(task_name, schema) if schema else None
+
     @task
     def planner_task(self) -> Task:
         # NOTE: enforce_json_schema=True only if your tasks.yaml defines expected_output_schema
         return Task(
             config=_get(self.tasks_config, "planner_task", "task"),
-            verbose=True,
+            verbose=self.verbose,
             output_file="artifacts/planner.json",
             allow_code_execution=False,
             code_execution_mode="safe",
@@ -168,14 +272,15 @@ class WebsiteCreator:
             enforce_json_schema=True,
             retry_on_schema_fail=True,
             callbacks=[],
-            context={"customer_request": "{customer_request}"},
+            guardrail=self._schema_guardrail("planner_task"),
+            context=_PLANNER_CTX,
         )
 
     @task
     def team_leader_task(self) -> Task:
         return Task(
             config=_get(self.tasks_config, "team_leader_task", "task"),
-            verbose=True,
+            verbose=self.verbose,
             output_file="artifacts/blueprint.md",
             allow_code_execution=False,
             code_execution_mode="safe",
@@ -184,17 +289,14 @@ class WebsiteCreator:
             enforce_json_schema=False,  # blueprint can be Markdown
             retry_on_schema_fail=False,
             callbacks=[],
-            context={
-                "planner_output": "planner_task.output",
-                "website_name": "{website_name}",
-            },
+            context=_TEAM_LEADER_CTX,
         )
 
     @task
     def frontend_developer_task(self) -> Task:
         return Task(
             config=_get(self.tasks_config, "frontend_developer_task", "task"),
-            verbose=True,
+            verbose=self.verbose,
             output_file="artifacts/frontend.json",
             allow_code_execution=True,
             code_execution_mode="safe",
@@ -203,18 +305,15 @@ class WebsiteCreator:
             enforce_json_schema=True,
             retry_on_schema_fail=True,
             callbacks=[],
-            context={
-                "planner_output": "planner_task.output",
-                "leader_blueprint": "team_leader_task.output",
-                "ui_framework": "gradio",
-            },
+            guardrail=self._schema_guardrail("frontend_developer_task"),
+            context=_FRONTEND_CTX,
         )
 
     @task
     def backend_developer_task(self) -> Task:
         return Task(
             config=_get(self.tasks_config, "backend_developer_task", "task"),
-            verbose=True,
+            verbose=self.verbose,
             output_file="artifacts/backend.json",
             allow_code_execution=True,
             code_execution_mode="safe",
@@ -223,18 +322,15 @@ class WebsiteCreator:
             enforce_json_schema=True,
             retry_on_schema_fail=True,
             callbacks=[],
-            context={
-                "planner_output": "planner_task.output",
-                "leader_blueprint": "team_leader_task.output",
-                "shared_classes": "frontend_developer_task.output.shared_classes",
-            },
+            guardrail=self._schema_guardrail("backend_developer_task"),
+            context=_BACKEND_CTX,
         )
 
     @task
     def integration_task(self) -> Task:
         return Task(
             config=_get(self.tasks_config, "integration_task", "task"),
-            verbose=True,
+            verbose=self.verbose,
             output_file="artifacts/integration.json",
             allow_code_execution=False,
             code_execution_mode="safe",
@@ -243,18 +339,15 @@ class WebsiteCreator:
             enforce_json_schema=True,
             retry_on_schema_fail=True,
             callbacks=[],
-            context={
-                "frontend_artifact": "frontend_developer_task.output",
-                "backend_artifact": "backend_developer_task.output",
-                "planner_output": "planner_task.output",
-            },
+            guardrail=self._schema_guardrail("integration_task"),
+            context=_INTEGRATION_CTX,
         )
 
     @task
     def repository_management_task(self) -> Task:
         return Task(
             config=_get(self.tasks_config, "repository_management_task", "task"),
-            verbose=True,
+            verbose=self.verbose,
             output_file="artifacts/repository.json",
             allow_code_execution=False,
             code_execution_mode="safe",
@@ -263,17 +356,15 @@ class WebsiteCreator:
             enforce_json_schema=True,
             retry_on_schema_fail=True,
             callbacks=[],
-            context={
-                "integration_output": "integration_task.output",
-                "website_folder": "website",
-            },
+            guardrail=self._schema_guardrail("repository_management_task"),
+            context=_REPOSITORY_CTX,
         )
 
     @task
     def testing_task(self) -> Task:
         return Task(
             config=_get(self.tasks_config, "testing_task", "task"),
-            verbose=True,
+            verbose=self.verbose,
             output_file="artifacts/test_report.json",
             allow_code_execution=False,
             code_execution_mode="safe",
@@ -282,18 +373,15 @@ class WebsiteCreator:
             enforce_json_schema=True,
             retry_on_schema_fail=True,
             callbacks=[],
-            context={
-                "features": "planner_task.output.features",
-                "final_directory": "repository_management_task.output.final_directory",
-                "launch_cmd": "python app.py",
-            },
+            guardrail=self._schema_guardrail("testing_task"),
+            context=_TESTING_CTX,
         )
 
     @task
     def evaluation_task(self) -> Task:
         return Task(
             config=_get(self.tasks_config, "evaluation_task", "task"),
-            verbose=True,
+            verbose=self.verbose,
             output_file="artifacts/evaluation.json",
             allow_code_execution=False,
             code_execution_mode="safe",
@@ -302,11 +390,8 @@ class WebsiteCreator:
             enforce_json_schema=True,
             retry_on_schema_fail=True,
             callbacks=[],
-            context={
-                "customer_request": "{customer_request}",
-                "test_report": "testing_task.output",
-                "repo_summary": "repository_management_task.output",
-            },
+            guardrail=self._schema_guardrail("evaluation_task"),
+            context=_EVALUATION_CTX,
         )
 
     # ---------------------------
@@ -344,13 +429,94 @@ class WebsiteCreator:
             tasks=self.tasks,
             process=Process.hierarchical,
             manager_agent=manager,
-            verbose=True,
+            verbose=self.verbose,
         )
 
+    def _kickoff(self, crew: Crew, inputs: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """Kick off `crew`, or replay a cached run with the same inputs, models and config."""
+        output_files = {t.name: t.output_file for t in crew.tasks if t.name and t.output_file}
+        key = None
+        if use_cache:
+            models = ",".join(_model_name(a) for a in [crew.manager_agent, *crew.agents])
+            key = ResponseCache.key("crew", inputs, models, self.config_digest)
+            cached = self.response_cache.get(key)
+            if _is_run_output(cached):
+                # Keep artifacts/ complete even when the model calls are skipped.
+                for name, raw in cached["tasks_output"].items():
+                    if name in output_files:
+                        path = Path(output_files[name])
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        write_bytes(path, raw.encode("utf-8"))
+                return cached
+
+        result = crew.kickoff(inputs=inputs)
+        output = {
+            "raw": str(result),
+            "tasks_output": {t.name: t.raw for t in result.tasks_output if t.name},
+        }
+        if key is not None:
+            self.response_cache.put(key, output)
+        return output
+
     # Optional convenience runner
-    def run(self, customer_request: str, website_name: str | None = None) -> Dict[str, Any]:
+    def run(
+        self,
+        customer_request: str,
+        website_name: str | None = None,
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        """Run the hierarchical crew once; with use_cache, identical inputs replay the previous run."""
         inputs = {
             "customer_request": customer_request,
             "website_name": website_name or "Generated Website",
         }
-        return self.crew().kickoff(inputs=inputs)
+        return self._kickoff(self.crew(), inputs, use_cache=use_cache)
+
+    async def run_many(
+        self, requests: List[Dict[str, Any]], max_inflight: int = 8, use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Kick off one crew per request, at most max_inflight at a time.
+
+        Request i writes its task artifacts under artifacts/run_<i>/ and its summary to
+        artifacts/run_<i>.json as soon as it finishes.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_inflight))
+        base = self.crew()
+
+        async def _one(i: int, request: Dict[str, Any]) -> Dict[str, Any]:
+            inputs = {**request, "website_name": request.get("website_name") or "Generated Website"}
+            async with semaphore:
+                try:
+                    # Why: kickoff mutates crew/task state, so every request gets its own copy,
+                    # and its own output dir so concurrent runs never write the same files.
+                    crew_copy = base.copy()
+                    for t in crew_copy.tasks:
+                        if t.output_file:
+                            t.output_file = str(ARTIFACTS_DIR / f"run_{i}" / Path(t.output_file).name)
+                    result = await asyncio.to_thread(self._kickoff, crew_copy, inputs, use_cache)
+                    summary = {"ok": True, "inputs": inputs, "result": result}
+                except Exception as e:
+                    summary = {"ok": False, "inputs": inputs, "error": str(e)}
+            await awrite_bytes(ARTIFACTS_DIR / f"run_{i}.json", dump_json(summary, indent=True))
+            return summary
+
+        return list(await asyncio.gather(*(_one(i, req) for i, req in enumerate(requests))))
+
+
+# CrewBase resolves agents_config/tasks_config through self.load_yaml; route it via the JSON cache.
+WebsiteCreator.load_yaml = staticmethod(load_config)
+
+
+_CREW_LOCK = threading.Lock()
+
+
+@functools.cache
+def _build_crew(**options: Any) -> WebsiteCreator:
+    return WebsiteCreator(**options)
+
+
+def get_crew(**options: Any) -> WebsiteCreator:
+    """Return the process-wide WebsiteCreator, built once per distinct set of options."""
+    # Why: functools.cache alone lets two first callers both build an instance.
+    with _CREW_LOCK:
+        return _build_crew(**options)
@@ -3,29 +3,24 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
 import sys
 import warnings
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Tuple
 
-# Third-party warning suppression (tokenizers sometimes import pysbd)
-warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
+from website_creator.artifacts import ARTIFACTS_DIR, dump_json, write_bytes
+from website_creator.config_loader import CONFIG_DIR, env_flag, execution_waves, load_config
 
-# Prefer relative import within the package layout:
-# Ensure this path matches your actual package. If your file lives next to crew.py as a module,
-# keep as from website_creator.crew import WebsiteCreator
-try:
-    from website_creator.crew import WebsiteCreator  # noqa: F401
-except Exception as exc:  # why: fail fast if packaging/import is wrong
-    raise SystemExit(
-        f"[main] Failed to import WebsiteCreator from website_creator.crew: {exc}"
-    )
+if TYPE_CHECKING:
+    from website_creator.crew import WebsiteCreator
 
-
-ARTIFACTS_DIR = Path("artifacts")
+# Third-party warning suppression (tokenizers sometimes import pysbd)
+warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 
 def _ensure_artifacts_dir() -> None:
@@ -34,9 +29,12 @@ def _ensure_artifacts_dir() -> None:
 
 def _stdin_text() -> str:
     if sys.stdin and not sys.stdin.isatty():
-        data = sys.stdin.read()
-        # Normalize newlines and trim
-        return data.replace("\r\n", "\n").strip()
+        buffer = getattr(sys.stdin, "buffer", None)
+        if buffer is None:  # e.g. stdin swapped for a StringIO
+            return sys.stdin.read().replace("\r\n", "\n").strip()
+        # Normalize newlines and trim on raw bytes, then decode once
+        data = buffer.read().replace(b"\r\n", b"\n").strip()
+        return data.decode("utf-8", "replace")
     return ""
 
 
@@ -50,31 +48,87 @@ def _ask_customer_request() -> str:
         return ""
 
 
-def _build_inputs(customer_request: str) -> Dict[str, Any]:
-    return {
-        "customer_request": customer_request,
+# Computed once per process; only customer_request varies between requests.
+_INPUTS_TEMPLATE = MappingProxyType(
+    {
+        "customer_request": "",
         "current_year": str(datetime.now().year),
     }
+)
 
 
-def _validate_crewai_yaml_loaded(wc: WebsiteCreator) -> None:
+def _build_inputs(customer_request: str) -> Dict[str, Any]:
+    return {**_INPUTS_TEMPLATE, "customer_request": customer_request}
+
+
+def _validate_config_dicts(agents_config: Any, tasks_config: Any) -> None:
     # why: CrewBase should have dicts loaded for agents/tasks; guard against path typos
-    if not isinstance(getattr(wc, "agents_config", None), dict):
+    if not isinstance(agents_config, dict):
         raise RuntimeError(
             "agents_config not loaded. Ensure 'config/agents.yaml' exists and CrewBase path is correct."
         )
-    if not isinstance(getattr(wc, "tasks_config", None), dict):
+    if not isinstance(tasks_config, dict):
         raise RuntimeError(
             "tasks_config not loaded. Ensure 'config/tasks.yaml' exists and CrewBase path is correct."
         )
 
 
+def _validate_crewai_yaml_loaded(wc: WebsiteCreator) -> None:
+    _validate_config_dicts(getattr(wc, "agents_config", None), getattr(wc, "tasks_config", None))
+
+
+def _import_crew() -> Tuple[type[WebsiteCreator], Callable[..., WebsiteCreator]]:
+    # Imported only once there is work to do: crewai pulls in litellm, pydantic, tokenizers, ...
+    # so --help and argument errors stay fast.
+    try:
+        from website_creator.crew import WebsiteCreator, get_crew
+    except Exception as exc:  # why: fail fast if packaging/import is wrong
+        raise SystemExit(
+            f"[main] Failed to import WebsiteCreator from website_creator.crew: {exc}"
+        )
+    return WebsiteCreator, get_crew
+
+
+def _maybe_warmup(args: argparse.Namespace, creator_cls: type[WebsiteCreator]) -> None:
+    if not (args.warmup or env_flag("WC_WARMUP", False)):
+        return
+    # why: warmup is an optimization; a failure here must not block the real run
+    try:
+        creator_cls.warmup()
+    except Exception as e:
+        print(f"[main] Warmup skipped: {e}", file=sys.stderr)
+
+
+def _write_stdout_json(payload: Dict[str, Any]) -> None:
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:  # e.g. stdout swapped for a StringIO
+        print(dump_json(payload).decode("utf-8"))
+        return
+    sys.stdout.flush()
+    buffer.write(dump_json(payload) + b"\n")
+    buffer.flush()
+
+
 def _persist_run_summary(payload: Dict[str, Any]) -> Path:
     path = ARTIFACTS_DIR / "run_summary.json"
-    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    write_bytes(path, dump_json(payload, indent=True))
     return path
 
 
+def _read_batch_file(path: Path) -> list[Dict[str, Any]]:
+    # One JSON object per line, each with at least "customer_request".
+    requests: list[Dict[str, Any]] = []
+    with open(path, "r", encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if not isinstance(item, dict) or not str(item.get("customer_request", "")).strip():
+                raise ValueError(f"{path}:{lineno}: expected an object with a non-empty 'customer_request'")
+            requests.append(item)
+    return requests
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Run the WebsiteCreator crew to build a website from your prompt."
@@ -101,7 +155,36 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Fail if no request provided via flag/stdin (useful for CI).",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate config wiring and print the execution plan without importing or running the crew.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the model; ignore and don't update artifacts/.cache.",
+    )
+    parser.add_argument(
+        "--warmup",
+        action="store_true",
+        help="Pre-initialize the LLM client and tokenizer before running (or set WC_WARMUP=1).",
+    )
+    parser.add_argument(
+        "--batch-file",
+        type=Path,
+        help="JSONL file of requests to run concurrently; run i writes artifacts/run_<i>/ and run_<i>.json.",
+    )
+    parser.add_argument(
+        "--max-inflight",
+        type=int,
+        default=8,
+        help="Max concurrent crews in --batch-file mode (default: 8).",
+    )
+    args = parser.parse_args(argv)
+    if args.batch_file and (args.customer_request or args.website_name):
+        parser.error("--batch-file cannot be combined with -r/--customer-request or -n/--website-name")
+    return args
 
 
 def resolve_customer_request(args: argparse.Namespace) -> str:
@@ -119,13 +202,100 @@ def resolve_customer_request(args: argparse.Namespace) -> str:
     return _ask_customer_request()
 
 
+def _run_batch(args: argparse.Namespace) -> int:
+    try:
+        requests = _read_batch_file(args.batch_file)
+    except (OSError, ValueError) as e:
+        print(f"[main] Invalid batch file: {e}", file=sys.stderr)
+        return 2
+    if not requests:
+        print(f"[main] Batch file {args.batch_file} has no requests.", file=sys.stderr)
+        return 2
+    if _stdin_text():
+        print(
+            "[main] --batch-file reads requests from the file; don't also pipe one via stdin.",
+            file=sys.stderr,
+        )
+        return 2
+
+    WebsiteCreator, get_crew = _import_crew()
+    _maybe_warmup(args, WebsiteCreator)
+
+    wc = get_crew(verbose=False)
+    _validate_crewai_yaml_loaded(wc)
+    try:
+        summaries = asyncio.run(
+            wc.run_many(requests, max_inflight=args.max_inflight, use_cache=not args.no_cache)
+        )
+    except KeyboardInterrupt:
+        print("\nInterrupted by user.", file=sys.stderr)
+        return 130
+
+    failed = sum(1 for s in summaries if not s["ok"])
+    if args.json:
+        _write_stdout_json({"ok": not failed, "runs": summaries})
+    else:
+        print(f"✅ Batch finished: {len(summaries) - failed}/{len(summaries)} succeeded.")
+        print(f"🗂  Summaries: {ARTIFACTS_DIR}/run_<i>.json")
+    return 1 if failed else 0
+
+
+def _dry_run(args: argparse.Namespace) -> int:
+    # why: CI wiring check in well under a second; reads configs via the JSON cache, never imports crewai
+    try:
+        agents_config = load_config(CONFIG_DIR / "agents.yaml")
+        tasks_config = load_config(CONFIG_DIR / "tasks.yaml")
+        _validate_config_dicts(agents_config, tasks_config)
+        for name, spec in tasks_config.items():
+            agent_name = spec.get("agent") if isinstance(spec, dict) else None
+            if agent_name and agent_name not in agents_config:
+                raise RuntimeError(f"Task '{name}' references unknown agent '{agent_name}'.")
+        waves = execution_waves(tasks_config)
+        batch = _read_batch_file(args.batch_file) if args.batch_file else []
+    except Exception as e:
+        print(f"[main] Dry run failed: {e}", file=sys.stderr)
+        return 1
+
+    args.no_prompt = True  # a dry run never blocks on interactive input
+    plan = {
+        "ok": True,
+        "dry_run": True,
+        "customer_request": None if args.batch_file else resolve_customer_request(args) or None,
+        "website_name": args.website_name or "Generated Website",
+        "batch_requests": len(batch),
+        "waves": waves,
+    }
+    if args.json:
+        _write_stdout_json(plan)
+    else:
+        print("🧪 Dry run: configs are valid; nothing was executed.")
+        if args.batch_file:
+            print(f"  Batch: {len(batch)} request(s) from {args.batch_file}")
+        else:
+            print(f"  Request: {plan['customer_request'] or '(none provided)'}")
+        print(f"  Website name: {plan['website_name']}")
+        print("  Task waves:")
+        for i, wave in enumerate(waves, start=1):
+            print(f"    {i}. {', '.join(wave)}")
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     # Best-effort sane I/O defaults
     os.environ.setdefault("PYTHONUTF8", "1")
+    # Must be set before crewai (and with it litellm/tokenizers) is imported below.
+    os.environ.setdefault("HF_HUB_DISABLE_TELEMETRY", "1")
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")  # avoids fork warning + lock
+    os.environ.setdefault("LITELLM_LOG", "ERROR")
 
     args = parse_args(argv)
+    if args.dry_run:
+        return _dry_run(args)
     _ensure_artifacts_dir()
 
+    if args.batch_file:
+        return _run_batch(args)
+
     customer_request = resolve_customer_request(args)
     if not customer_request:
         print("No website description provided. Use -r/--customer-request or pipe via stdin.", file=sys.stderr)
@@ -133,14 +303,21 @@ def main(argv: list[str] | None = None) -> int:
 
     inputs = _build_inputs(customer_request)
 
-    # Build and validate crew wiring
-    wc = WebsiteCreator()
+    WebsiteCreator, get_crew = _import_crew()
+    _maybe_warmup(args, WebsiteCreator)
+
+    # Build and validate crew wiring; --json output must not be interleaved with agent chatter
+    wc = get_crew(verbose=False) if args.json else get_crew()
     _validate_crewai_yaml_loaded(wc)
 
     # Prefer the convenience runner if you added it; otherwise call crew().kickoff
     try:
         if hasattr(wc, "run") and callable(getattr(wc, "run")):
-            result = wc.run(customer_request=customer_request, website_name=args.website_name)
+            result = wc.run(
+                customer_request=customer_request,
+                website_name=args.website_name,
+                use_cache=not args.no_cache,
+            )
         else:
             # Fallback path if .run() is not present
             crew = wc.crew()
@@ -176,7 +353,7 @@ def main(argv: list[str] | None = None) -> int:
     summary_path = _persist_run_summary(summary)
 
     if args.json:
-        print(json.dumps(summary, ensure_ascii=False))
+        _write_stdout_json(summary)
     else:
         print("✅ Crew finished.")
         print(f"🗂  Artifacts: {summary_path}")
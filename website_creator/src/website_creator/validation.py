@@ -0,0 +1,75 @@
+# file: src/website_creator/validation.py
+from __future__ import annotations
+
+import json
+import re
+import threading
+from typing import Any, Callable, Dict
+
+try:
+    import fastjsonschema
+except ImportError:  # optional speedup; jsonschema is the fallback
+    fastjsonschema = None
+
+Validator = Callable[[Any], Any]
+
+# LLMs often wrap JSON replies in a ```json ... ``` fence.
+_CODE_FENCE = re.compile(r"^\s*```[\w-]*\s*\n(.*?)\n?\s*```\s*$", re.DOTALL)
+
+# Keyed by the schema's canonical JSON, so identical schemas share one compiled validator.
+_COMPILED_VALIDATORS: Dict[str, Validator] = {}
+_COMPILE_LOCK = threading.Lock()
+
+
+def _compile(schema: Dict[str, Any]) -> Validator:
+    if fastjsonschema is not None:
+        return fastjsonschema.compile(schema)  # raises JsonSchemaValueException (a ValueError)
+
+    from jsonschema import Draft7Validator
+    from jsonschema.exceptions import best_match
+
+    checker = Draft7Validator(schema)
+
+    def validate(data: Any) -> Any:
+        error = best_match(checker.iter_errors(data))
+        if error is not None:
+            raise ValueError(error.message)
+        return data
+
+    return validate
+
+
+def compiled_validator(schema: Dict[str, Any]) -> Validator:
+    """Return a validator for `schema`, compiling it only the first time it is seen."""
+    key = json.dumps(schema, sort_keys=True)
+    validator = _COMPILED_VALIDATORS.get(key)
+    if validator is None:
+        with _COMPILE_LOCK:
+            validator = _COMPILED_VALIDATORS.get(key)
+            if validator is None:
+                validator = _COMPILED_VALIDATORS[key] = _compile(schema)
+    return validator
+
+
+def strip_code_fence(text: str) -> str:
+    match = _CODE_FENCE.match(text)
+    return match.group(1).strip() if match else text.strip()
+
+
+def output_guardrail(task_name: str, schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Build a Task guardrail that checks output against the task's expected_output_schema.
+
+    Returns (False, reason) on mismatch so CrewAI retries the task instead of aborting the run.
+    """
+    validate = compiled_validator(schema)
+
+    # NOTE: no return annotation: CrewAI inspects it at runtime and rejects string annotations.
+    def guardrail(output):  # type: ignore[no-untyped-def]
+        text = strip_code_fence(str(getattr(output, "raw", output)))
+        try:
+            validate(json.loads(text))
+        except ValueError as e:
+            return False, f"{task_name} output does not match expected_output_schema: {e}"
+        return True, text
+
+    return guardrail